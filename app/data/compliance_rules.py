@@ -0,0 +1,219 @@
+# Generated by scripts/compile_rules.py from compliance.json.
+# Do not edit by hand; edit compliance.json and regenerate.
+
+SECTIONS = [{'section': 'Fire Safety',
+  'tasks': [{'task_id': 'fire_alarm_service_certificate',
+             'label': 'Fire Alarm Service Certificate',
+             'category': 'Fire Safety',
+             'frequency': 'Quarterly',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 20,
+             'info_popup': 'Quarterly service certificate from the fire alarm '
+                           'maintenance contractor (IS 3218).'},
+            {'task_id': 'fire_extinguisher_certificate',
+             'label': 'Fire Extinguisher Service Certificate',
+             'category': 'Fire Safety',
+             'frequency': 'Annually',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 20,
+             'info_popup': 'Annual service certificate covering all portable '
+                           'extinguishers on site.'},
+            {'task_id': 'emergency_lighting_certificate',
+             'label': 'Emergency Lighting Test Certificate',
+             'category': 'Fire Safety',
+             'frequency': 'Quarterly',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 15,
+             'info_popup': 'Quarterly duration test certificate for emergency lighting '
+                           '(IS 3217).'},
+            {'task_id': 'fire_risk_assessment',
+             'label': 'Fire Risk Assessment',
+             'category': 'Fire Safety',
+             'frequency': 'Annually',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 25,
+             'info_popup': 'Annual fire risk assessment carried out by a competent '
+                           'assessor.'},
+            {'task_id': 'fire_drill_record',
+             'label': 'Fire Drill Record',
+             'category': 'Fire Safety',
+             'frequency': 'TwiceYearly',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 10,
+             'info_popup': 'Record of evacuation drill including times and '
+                           'observations.'},
+            {'task_id': 'fire_walk_weekly',
+             'label': 'Weekly Fire Walk',
+             'category': 'Fire Safety',
+             'frequency': 'Weekly',
+             'type': 'confirmation',
+             'needs_report': 'no',
+             'points': 5,
+             'info_popup': 'Weekly walk of escape routes, final exits and alarm '
+                           'panel.'}]},
+ {'section': 'Water Hygiene',
+  'tasks': [{'task_id': 'legionella_risk_assessment',
+             'label': 'Legionella Risk Assessment',
+             'category': 'Water Hygiene',
+             'frequency': 'Annually',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 25,
+             'info_popup': 'Legionella risk assessment per HPSC guidance.'},
+            {'task_id': 'tmv_service_certificate',
+             'label': 'TMV Service Certificate',
+             'category': 'Water Hygiene',
+             'frequency': 'Annually',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 15,
+             'info_popup': 'Annual service of thermostatic mixing valves.'},
+            {'task_id': 'calorifier_inspection',
+             'label': 'Calorifier Inspection Report',
+             'category': 'Water Hygiene',
+             'frequency': 'Annually',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 10,
+             'info_popup': 'Annual internal inspection and disinfection of '
+                           'calorifiers.'},
+            {'task_id': 'water_temperature_checks',
+             'label': 'Water Temperature Checks',
+             'category': 'Water Hygiene',
+             'frequency': 'Monthly',
+             'type': 'confirmation',
+             'needs_report': 'no',
+             'points': 5,
+             'info_popup': 'Monthly sentinel outlet temperature checks logged on '
+                           'site.'}]},
+ {'section': 'Electrical',
+  'tasks': [{'task_id': 'eicr_certificate',
+             'label': 'EICR Certificate',
+             'category': 'Electrical',
+             'frequency': 'Annually',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 25,
+             'info_popup': 'Periodic electrical installation condition report.'},
+            {'task_id': 'pat_testing',
+             'label': 'PAT Testing Certificate',
+             'category': 'Electrical',
+             'frequency': 'Annually',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 15,
+             'info_popup': 'Portable appliance testing certificate for the full '
+                           'inventory.'},
+            {'task_id': 'thermal_imaging_survey',
+             'label': 'Thermal Imaging Survey',
+             'category': 'Electrical',
+             'frequency': 'Annually',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 10,
+             'info_popup': 'Thermographic survey of distribution boards.'}]},
+ {'section': 'Gas',
+  'tasks': [{'task_id': 'gas_safety_certificate',
+             'label': 'Gas Safety Certificate',
+             'category': 'Gas',
+             'frequency': 'Annually',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 25,
+             'info_popup': 'Annual RGI certificate for gas appliances and pipework.'},
+            {'task_id': 'kitchen_gas_interlock_test',
+             'label': 'Kitchen Gas Interlock Test',
+             'category': 'Gas',
+             'frequency': 'Annually',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 10,
+             'info_popup': 'Annual proving test of the kitchen gas interlock '
+                           'system.'}]},
+ {'section': 'Lifts',
+  'tasks': [{'task_id': 'lift_service_certificate',
+             'label': 'Lift Service Certificate',
+             'category': 'Lifts',
+             'frequency': 'Quarterly',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 20,
+             'info_popup': 'Quarterly maintenance visit report from the lift '
+                           'contractor.'},
+            {'task_id': 'lift_insurance_inspection',
+             'label': 'Lift Insurance Inspection',
+             'category': 'Lifts',
+             'frequency': 'TwiceYearly',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 15,
+             'info_popup': 'Statutory thorough examination report (LOLER '
+                           'equivalent).'}]},
+ {'section': 'Kitchen',
+  'tasks': [{'task_id': 'kitchen_extract_cleaning',
+             'label': 'Kitchen Extract Deep Clean',
+             'category': 'Kitchen',
+             'frequency': 'TwiceYearly',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 15,
+             'info_popup': 'TR19 deep clean certificate for the kitchen extract '
+                           'system.'},
+            {'task_id': 'ansul_system_service',
+             'label': 'Ansul System Service',
+             'category': 'Kitchen',
+             'frequency': 'TwiceYearly',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 15,
+             'info_popup': 'Service certificate for the kitchen fire suppression '
+                           'system.'},
+            {'task_id': 'grease_trap_cleaning',
+             'label': 'Grease Trap Cleaning',
+             'category': 'Kitchen',
+             'frequency': 'Monthly',
+             'type': 'confirmation',
+             'needs_report': 'no',
+             'points': 5,
+             'info_popup': 'Monthly grease trap empty and clean, logged on site.'}]},
+ {'section': 'Pool & Leisure',
+  'tasks': [{'task_id': 'pool_water_testing',
+             'label': 'Pool Water Test Report',
+             'category': 'Pool & Leisure',
+             'frequency': 'Monthly',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 10,
+             'info_popup': 'Monthly microbiological test report for pool and spa '
+                           'water.'},
+            {'task_id': 'pool_plant_inspection',
+             'label': 'Pool Plant Inspection',
+             'category': 'Pool & Leisure',
+             'frequency': 'Quarterly',
+             'type': 'upload',
+             'needs_report': 'yes',
+             'points': 10,
+             'info_popup': 'Quarterly inspection of pool plant and dosing '
+                           'equipment.'}]},
+ {'section': 'General',
+  'tasks': [{'task_id': 'ladder_inspection',
+             'label': 'Ladder Inspection',
+             'category': 'General',
+             'frequency': 'Monthly',
+             'type': 'confirmation',
+             'needs_report': 'no',
+             'points': 5,
+             'info_popup': 'Monthly visual inspection of ladders and steps register.'},
+            {'task_id': 'first_aid_kit_check',
+             'label': 'First Aid Kit Check',
+             'category': 'General',
+             'frequency': 'Monthly',
+             'type': 'confirmation',
+             'needs_report': 'no',
+             'points': 5,
+             'info_popup': 'Monthly restock check of first aid kits.'}]}]
@@ -0,0 +1,69 @@
+import os
+
+from dotenv import load_dotenv
+
+# One dotenv load for the whole process, before the routers read env at
+# import; a no-op when the environment is already injected (containers).
+if not os.getenv("AWS_BUCKET_NAME"):
+    load_dotenv()
+
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+
+from app.routers import (
+    compliance_score,
+    compliance_tasks,
+    drawings,
+    due_tasks,
+    files,
+    history,
+    hotel_facilities,
+    monthly_checklist,
+    parse_pdf,
+)
+from app.utils import aws
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the shared async S3 client once per process instead of per
+    # request; handlers reach it through app.utils.aws.aio_s3.
+    async with aws.aio_client_ctx() as client:
+        aws.aio_s3 = client
+        yield
+    aws.aio_s3 = None
+
+
+# ORJSONResponse as the app-wide default: every plain-dict handler
+# serializes through orjson instead of the stdlib encoder.
+app = FastAPI(
+    title="JMK FM Backend",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+app.include_router(history.router)
+app.include_router(compliance_score.router)
+app.include_router(compliance_tasks.router)
+app.include_router(files.router)
+app.include_router(due_tasks.router)
+app.include_router(drawings.router)
+app.include_router(hotel_facilities.router)
+app.include_router(monthly_checklist.router)
+app.include_router(parse_pdf.router)
+
+
+@app.get("/")
+def root():
+    return {"status": "ok"}
@@ -0,0 +1,51 @@
+"""File-tree construction for the files router.
+
+Kept as a self-contained, fully annotated module so it can be compiled
+with mypyc (or rewritten in Cython) without touching the router; the
+functions use only dicts, lists and str operations that compile to
+native code cleanly.
+"""
+
+from collections import defaultdict
+from typing import Optional
+
+import msgspec
+
+
+def _tree_node() -> defaultdict:
+    return defaultdict(_tree_node)
+
+
+def build_tree(keys: list) -> dict:
+    """Trie of path components; leaves map filename -> full key.
+
+    defaultdict inserts intermediate folders in one hash per component,
+    where the membership-test-then-insert shape hashed each twice."""
+    root: defaultdict = _tree_node()
+    for key in keys:
+        parts: list = key.split("/")
+        node: dict = root
+        for part in parts[:-1]:
+            node = node[part]
+        node[parts[-1]] = key
+    return root
+
+
+class Node(msgspec.Struct):
+    """Tree node; msgspec encodes these straight to JSON bytes without
+    the dict round trip FastAPI's jsonable_encoder would take."""
+
+    name: str
+    path: Optional[str] = None
+    children: Optional[list] = None
+
+
+def tree_to_nodes(node: dict) -> list:
+    result: list = []
+    append = result.append
+    for name, value in node.items():
+        if isinstance(value, str):
+            append(Node(name=name, path=value))
+        else:
+            append(Node(name=name, children=tree_to_nodes(value)))
+    return result
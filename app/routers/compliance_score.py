@@ -0,0 +1,208 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import orjson
+from fastapi import APIRouter, BackgroundTasks
+
+from app.utils.aws import s3
+from app.utils.compliance_history import BUCKET_NAME
+from app.utils.compliance_index import load_compliance_index_async
+from app.utils.rules import task_specs
+from app.utils.score_cache import get_score, set_score
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/score", tags=["score"])
+
+# Caps the fallback-scan fan-out so a burst of report GETs can't draw
+# 503 slowdowns from S3.
+_SCAN_CONCURRENCY = 64
+
+
+def is_still_valid(report_date: str, interval_days: int) -> bool:
+    # fromisoformat is ~10x faster than strptime's format-string parser.
+    parsed = datetime.fromisoformat(report_date[:10])
+    return parsed >= datetime.utcnow() - timedelta(days=interval_days)
+
+
+# Newest-first fetch batch for the fallback scan; small enough that the
+# early exit below skips most historical reports.
+_SCAN_BATCH = 8
+
+
+async def _scan_task_reports(hotel_id: str, spec, sem: asyncio.Semaphore):
+    """Fallback for hotels without an index yet: list the task prefix and
+    read report JSONs newest-first, stopping once the task already has
+    enough valid reports to hit its expected count."""
+    from app.utils import aws
+
+    task_id = spec.task_id
+
+    # Paginate rather than a single list call: one response silently
+    # truncates at 1000 keys, undercounting busy tasks.
+    paginator = aws.aio_s3.get_paginator("list_objects_v2")
+    json_objs = []
+    async for page in paginator.paginate(
+        Bucket=BUCKET_NAME,
+        Prefix=f"{hotel_id}/compliance/{task_id}/",
+        PaginationConfig={"PageSize": 1000},
+    ):
+        json_objs.extend(
+            o for o in page.get("Contents", []) if o["Key"].endswith(".json")
+        )
+
+    async def fetch(obj):
+        async with sem:
+            # Uploads stamp report_date into object user-metadata, so a
+            # HeadObject answers from the initial HTTP response with no
+            # body to stream or decode.
+            head = await aws.aio_s3.head_object(Bucket=BUCKET_NAME, Key=obj["Key"])
+            report_date = head.get("Metadata", {}).get("report-date")
+            if not report_date:
+                # Objects written before metadata stamping: fall back to
+                # projecting the field server-side via S3 Select.
+                resp = await aws.aio_s3.select_object_content(
+                    Bucket=BUCKET_NAME,
+                    Key=obj["Key"],
+                    ExpressionType="SQL",
+                    Expression="SELECT s.report_date FROM S3Object s",
+                    InputSerialization={"JSON": {"Type": "DOCUMENT"}},
+                    OutputSerialization={"JSON": {}},
+                )
+                chunks = []
+                async for event in resp["Payload"]:
+                    if "Records" in event:
+                        chunks.append(event["Records"]["Payload"])
+                data = orjson.loads(b"".join(chunks)) if chunks else {}
+                report_date = data.get("report_date")
+        if not report_date:
+            return None
+        return {
+            "report_date": report_date,
+            "last_modified": obj["LastModified"].isoformat(),
+        }
+
+    # LastModified is a conservative proxy for report recency, so walking
+    # newest-first lets annual tasks stop after a single fetch.
+    json_objs.sort(key=lambda o: o["LastModified"], reverse=True)
+
+    reports = []
+    valid = 0
+    for i in range(0, len(json_objs), _SCAN_BATCH):
+        batch = json_objs[i : i + _SCAN_BATCH]
+        fetched = await asyncio.gather(*(fetch(o) for o in batch))
+        for r in fetched:
+            if r is None:
+                continue
+            reports.append(r)
+            if is_still_valid(r["report_date"], spec.interval_days):
+                valid += 1
+        if valid >= spec.expected_count:
+            break
+    return reports
+
+
+async def _scan_all_reports(hotel_id: str, specs) -> dict:
+    """Scan every task prefix concurrently; wall time is bounded by the
+    slowest task instead of the sum of all of them."""
+    sem = asyncio.Semaphore(_SCAN_CONCURRENCY)
+    scans = await asyncio.gather(
+        *(_scan_task_reports(hotel_id, s, sem) for s in specs)
+    )
+    return {s.task_id: reports for s, reports in zip(specs, scans)}
+
+
+def _score_task(spec, reports: list, monthly_history: dict) -> dict:
+    """Score one task from its report metadata and fold the valid reports
+    into the monthly history buckets."""
+    points = spec.points
+    valid_dates = [
+        r["report_date"]
+        for r in reports
+        if r.get("report_date") and is_still_valid(r["report_date"], spec.interval_days)
+    ]
+    expected = spec.expected_count
+    score = round(points * min(len(valid_dates), expected) / expected, 1)
+
+    for report_date in valid_dates:
+        fdate = datetime.fromisoformat(report_date[:10])
+        # Integer month key (months since year 0); strftime in this loop
+        # would re-run the libc format parser for every report.
+        bucket = monthly_history[fdate.year * 12 + fdate.month - 1]
+        bucket[0] += points
+        bucket[1] += points
+
+    return {
+        "score": score,
+        "max": points,
+        "uploads": len(valid_dates),
+        "expected": expected,
+    }
+
+
+def _persist_latest(hotel_id: str, result: dict):
+    """Write the cached score snapshot after the response has gone out."""
+    try:
+        s3.put_object(
+            Bucket=BUCKET_NAME,
+            Key=f"{hotel_id}/compliance/latest.json",
+            Body=json.dumps(result),
+            ContentType="application/json",
+        )
+    except Exception:
+        logger.exception(f"Failed to persist latest.json for {hotel_id}")
+
+
+@router.get("/{hotel_id}")
+async def get_compliance_score(hotel_id: str, background_tasks: BackgroundTasks):
+    """Score a hotel's compliance uploads against the rules file.
+
+    Report metadata comes from the per-hotel aggregate index written by
+    add_history_entry, so the hot path is a single S3 GET instead of a
+    listing plus one GET per report JSON; repeat views inside the cache
+    TTL skip S3 entirely.
+    """
+    cached = get_score(hotel_id)
+    if cached is not None:
+        return cached
+
+    specs = task_specs()
+
+    index = await load_compliance_index_async(hotel_id)
+    if index is None:
+        index = await _scan_all_reports(hotel_id, specs)
+
+    total_score = 0
+    max_score = 0
+    task_scores = {}
+    # [score, max] pairs; defaultdict turns the test-insert-update dance
+    # into a single lookup per report.
+    monthly_history = defaultdict(lambda: [0, 0])
+
+    for spec in specs:
+        scored = _score_task(spec, index.get(spec.task_id, []), monthly_history)
+        task_scores[spec.task_id] = scored
+        total_score += scored["score"]
+        max_score += scored["max"]
+
+    result = {
+        "hotel_id": hotel_id,
+        "score": round(total_score, 1),
+        "max_score": max_score,
+        "percent": round(100 * total_score / max_score, 1) if max_score else 0,
+        "task_scores": task_scores,
+        # Month keys are formatted once here, at serialization time.
+        "monthly_history": {
+            f"{k // 12:04d}-{k % 12 + 1:02d}": {"score": s, "max": m}
+            for k, (s, m) in sorted(monthly_history.items())
+        },
+        "generated_at": datetime.utcnow().isoformat(),
+    }
+
+    set_score(hotel_id, result)
+    background_tasks.add_task(_persist_latest, hotel_id, result)
+
+    return result
@@ -0,0 +1,48 @@
+import os
+
+from fastapi import APIRouter
+
+from app.utils.aws import s3
+from app.utils.rules import flat_tasks, task_labels
+
+BUCKET_NAME = os.getenv("AWS_BUCKET_NAME", "jmk-fm-reports")
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+
+@router.get("")
+def get_all_tasks():
+    """Every compliance task with its section, from the cached rules."""
+    return {
+        "tasks": [{"section": section, **task} for section, task in flat_tasks()]
+    }
+
+
+@router.get("/uploaded/{hotel_id}")
+def get_uploaded_task_ids(hotel_id: str):
+    """Task ids that have at least one upload for this hotel.
+
+    Delimiter listing returns one CommonPrefix per task folder, so the
+    response is O(tasks) entries rather than every file in the hotel's
+    compliance tree.
+    """
+    # Paginated so a single truncated response can never drop prefixes;
+    # one list call still doesn't guarantee completeness past 1000 keys.
+    paginator = s3.get_paginator("list_objects_v2")
+    task_ids = []
+    for page in paginator.paginate(
+        Bucket=BUCKET_NAME,
+        Prefix=f"{hotel_id}/compliance/",
+        Delimiter="/",
+        PaginationConfig={"PageSize": 1000},
+    ):
+        task_ids.extend(
+            p["Prefix"].rstrip("/").rsplit("/", 1)[-1]
+            for p in page.get("CommonPrefixes", [])
+        )
+    return {"hotel_id": hotel_id, "task_ids": task_ids}
+
+
+@router.get("/labels")
+def get_task_labels():
+    return task_labels()
@@ -0,0 +1,55 @@
+import logging
+import os
+from collections import defaultdict
+
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+
+from app.utils.aws import s3
+
+logger = logging.getLogger(__name__)
+
+BUCKET_NAME = os.getenv("AWS_BUCKET_NAME", "jmk-fm-reports")
+
+router = APIRouter(prefix="/drawings", tags=["drawings"])
+
+
+def drawings_prefix(hotel_id: str) -> str:
+    return f"{hotel_id}/drawings/"
+
+
+@router.get("/{hotel_id}")
+def get_drawings(hotel_id: str):
+    """Drawing filenames for a hotel, grouped by category folder."""
+    prefix = drawings_prefix(hotel_id)
+    prefix_len = len(prefix)
+    paginator = s3.get_paginator("list_objects_v2")
+    # defaultdict: one hash per object, where membership-test-then-insert
+    # hashed the category twice; partition skips the list allocation
+    # split would make.
+    categories = defaultdict(list)
+    for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            category, _, filename = obj["Key"][prefix_len:].partition("/")
+            if filename:
+                categories[category].append(filename)
+    return {"hotel_id": hotel_id, "categories": dict(categories)}
+
+
+@router.post("/upload")
+async def upload_drawing(
+    hotel_id: str = Form(...),
+    category: str = Form(...),
+    file: UploadFile = File(...),
+):
+    """Store a drawing under its hotel and category folder."""
+    if not file.filename:
+        raise HTTPException(status_code=422, detail="file must have a name")
+    key = f"{drawings_prefix(hotel_id)}{category}/{file.filename}"
+    s3.put_object(
+        Bucket=BUCKET_NAME,
+        Key=key,
+        Body=await file.read(),
+        ContentType=file.content_type or "application/octet-stream",
+    )
+    logger.debug("Uploaded drawing %s", key)
+    return {"status": "ok", "key": key}
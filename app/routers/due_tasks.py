@@ -0,0 +1,251 @@
+import asyncio
+import functools
+import logging
+import os
+import re
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from types import MappingProxyType
+
+import orjson
+from botocore.exceptions import ClientError
+from cachetools import TTLCache
+from fastapi import APIRouter
+from pydantic import BaseModel
+
+from app.routers.files import BUCKET_NAME
+from app.utils.aws import s3
+from app.utils.rules import RULES_PATH, load_sections
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/due", tags=["due"])
+
+# Listing plus ack probe per task all run together; the cap keeps the
+# burst inside the shared client's connection pool.
+_DUE_CONCURRENCY = 32
+
+# Ack markers change at most a few times a day per hotel, so the key
+# set is cached briefly; the acknowledge route invalidates on write.
+# That route is sync (worker thread) while the reader runs on the event
+# loop, and TTLCache mutates internal state on every access, so both
+# sides take the lock.
+_ack_cache = TTLCache(maxsize=64, ttl=60)
+_ack_lock = threading.Lock()
+
+# Upload keys embed the report date ({date}_{uid}.json), so the latest
+# report for a task can be read straight off the listing.
+_DATE_IN_KEY = re.compile(r"/(\d{4}-\d{2}-\d{2})_[^/]*\.json$")
+
+# Hoisted out of the per-task loop, which built a fresh dict every
+# iteration; the proxy keeps it read-only.
+_PERIOD_DAYS = MappingProxyType(
+    {
+        "Daily": 1,
+        "Weekly": 7,
+        "Monthly": 30,
+        "Quarterly": 90,
+        "TwiceYearly": 180,
+        "Annually": 365,
+    }
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _upload_tasks(mtime):
+    """(task_id, period_days, base_item) triples, rendered once per
+    rules-file version; the handler only fills the per-request fields."""
+    rendered = []
+    for section in load_sections():
+        for task in section.get("tasks", []):
+            if task.get("type") != "upload":
+                continue
+            period_days = _PERIOD_DAYS.get(task.get("frequency"), 0)
+            if not period_days:
+                continue
+            task_id = task["task_id"]
+            rendered.append(
+                (
+                    task_id,
+                    period_days,
+                    {
+                        "task_id": task_id,
+                        "label": task.get("label", task_id),
+                        "category": task.get("category", section["section"]),
+                        "frequency": task.get("frequency"),
+                        "points": task.get("points", 20),
+                    },
+                )
+            )
+    return tuple(rendered)
+
+
+def upload_tasks() -> tuple:
+    return _upload_tasks(os.path.getmtime(RULES_PATH))
+
+
+class AcknowledgeRequest(BaseModel):
+    hotel_id: str
+    task_id: str
+
+
+def _ack_key(hotel_id: str, task_id: str, month_key: str) -> str:
+    return f"{hotel_id}/acknowledged/{task_id}-{month_key}.json"
+
+
+async def _list_report_keys_by_task(hotel_id: str) -> dict:
+    """One listing of the whole compliance prefix, bucketed by task_id.
+
+    Replaces a listing per task: the full prefix comes back in
+    ceil(total_keys/1000) calls and keys are grouped in memory. Hotel-
+    level objects like _index.json have no task segment and are skipped.
+    """
+    from app.utils import aws
+
+    paginator = aws.aio_s3.get_paginator("list_objects_v2")
+    buckets = defaultdict(list)
+    async for page in paginator.paginate(
+        Bucket=BUCKET_NAME,
+        Prefix=f"{hotel_id}/compliance/",
+        PaginationConfig={"PageSize": 1000},
+    ):
+        for obj in page.get("Contents", []):
+            parts = obj["Key"].split("/", 3)
+            if len(parts) == 4 and parts[3]:
+                buckets[parts[2]].append(obj["Key"])
+    return buckets
+
+
+async def _latest_report_date(hotel_id: str, keys: list, sem: asyncio.Semaphore):
+    """Newest report_date for one task's key list.
+
+    The date comes out of the key for current uploads; objects written
+    before dates were embedded fall back to one GetObject each.
+    """
+    from app.utils import aws
+
+    # S3 lists keys in ascending lexicographic order and upload keys
+    # start with the ISO date, so the newest report is simply the last
+    # date-keyed entry; no object bodies are read at all.
+    for key in reversed(keys):
+        match = _DATE_IN_KEY.search(key)
+        if match:
+            return datetime.fromisoformat(match.group(1))
+
+    # Only hotels whose every report predates date-keyed uploads fall
+    # through to reading bodies; ISO dates still compare as strings.
+    # The empty string sorts below every date, so the maximum tracks
+    # without a did-we-see-anything branch per iteration.
+    latest = ""
+    for key in keys:
+        if not key.endswith(".json"):
+            continue
+        try:
+            async with sem:
+                obj_resp = await aws.aio_s3.get_object(Bucket=BUCKET_NAME, Key=key)
+                body = await obj_resp["Body"].read()
+            report_date = orjson.loads(body)["report_date"][:10]
+        except ClientError as err:
+            # A report deleted between listing and fetch is fine to skip;
+            # timeouts and throttling must surface instead of silently
+            # stacking retry latency on top of botocore's own retries.
+            if err.response.get("Error", {}).get("Code") not in (
+                "404",
+                "NoSuchKey",
+                "NotFound",
+            ):
+                raise
+            continue
+        except (KeyError, TypeError, orjson.JSONDecodeError):
+            logger.warning("Malformed report object %s", key)
+            continue
+        if report_date > latest:
+            latest = report_date
+    return datetime.fromisoformat(latest) if latest else None
+
+
+async def _list_ack_keys(hotel_id: str) -> set:
+    """All acknowledgement marker keys for a hotel, in one listing.
+
+    Membership checks against this set replace one HeadObject per task;
+    the ack prefix holds at most a handful of keys per month. Repeat
+    GETs inside the cache TTL skip the listing entirely."""
+    from app.utils import aws
+
+    with _ack_lock:
+        cached = _ack_cache.get(hotel_id)
+    if cached is not None:
+        return cached
+
+    paginator = aws.aio_s3.get_paginator("list_objects_v2")
+    keys = set()
+    async for page in paginator.paginate(
+        Bucket=BUCKET_NAME, Prefix=f"{hotel_id}/acknowledged/"
+    ):
+        keys.update(o["Key"] for o in page.get("Contents", []))
+    with _ack_lock:
+        _ack_cache[hotel_id] = keys
+    return keys
+
+
+@router.get("/{hotel_id}")
+async def get_due_tasks(hotel_id: str):
+    """Upload tasks grouped into due-now and due-soon for a hotel.
+
+    Every task's listing and ack probe run concurrently, so the S3 cost
+    is roughly one round trip rather than one per task."""
+    tasks = upload_tasks()
+
+    now = datetime.utcnow()
+    month_key = now.strftime("%Y-%m")
+    # Bounds computed once; the loop compares float timestamps instead of
+    # dispatching through datetime rich comparison per task.
+    now_ts = now.timestamp()
+    soon_ts = (now + timedelta(days=31)).timestamp()
+    due_now = []
+    due_soon = []
+
+    sem = asyncio.Semaphore(_DUE_CONCURRENCY)
+    ack_keys, report_keys = await asyncio.gather(
+        _list_ack_keys(hotel_id), _list_report_keys_by_task(hotel_id)
+    )
+    latests = await asyncio.gather(
+        *(
+            _latest_report_date(hotel_id, report_keys.get(task_id, []), sem)
+            for task_id, _, _ in tasks
+        )
+    )
+
+    for (task_id, period_days, base), latest in zip(tasks, latests):
+        next_due = latest + timedelta(days=period_days) if latest else now
+        acknowledged = _ack_key(hotel_id, task_id, month_key) in ack_keys
+
+        item = {
+            **base,
+            "last_report": latest.date().isoformat() if latest else None,
+            "next_due": next_due.date().isoformat(),
+            "acknowledged": acknowledged,
+        }
+        next_due_ts = next_due.timestamp()
+        if next_due_ts <= now_ts and not acknowledged:
+            due_now.append(item)
+        elif next_due_ts <= soon_ts:
+            due_soon.append(item)
+
+    return {"hotel_id": hotel_id, "due_now": due_now, "due_soon": due_soon}
+
+
+@router.post("/acknowledge")
+def acknowledge_task(payload: AcknowledgeRequest):
+    """Snooze a due task for the current month."""
+    month_key = datetime.utcnow().strftime("%Y-%m")
+    s3.put_object(
+        Bucket=BUCKET_NAME,
+        Key=_ack_key(payload.hotel_id, payload.task_id, month_key),
+        Body=orjson.dumps({"acknowledged_at": datetime.utcnow().isoformat()}),
+        ContentType="application/json",
+    )
+    with _ack_lock:
+        _ack_cache.pop(payload.hotel_id, None)
+    return {"status": "ok"}
@@ -0,0 +1,129 @@
+import logging
+import os
+import uuid
+from datetime import datetime
+
+import msgspec
+import orjson
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.responses import Response
+
+from app.routers._tree import build_tree, tree_to_nodes
+from app.services.storage_service import generate_signed_url
+from app.utils.aws import s3
+from app.utils.compliance_history import add_history_entry
+
+logger = logging.getLogger(__name__)
+
+BUCKET_NAME = os.getenv("AWS_BUCKET_NAME", "jmk-fm-reports")
+
+router = APIRouter(prefix="/files", tags=["files"])
+
+
+@router.post("/upload")
+async def upload_file(
+    hotel_id: str = Form(...),
+    task_id: str = Form(...),
+    report_date: str = Form(...),
+    uploaded_by: str = Form("unknown"),
+    file: UploadFile = File(...),
+):
+    """Store a compliance report and record it in the task history.
+
+    The report date is embedded in the object key and stamped into
+    user-metadata, so listings and HeadObject answer date queries without
+    anyone fetching the JSON body.
+    """
+    date = report_date[:10]
+    try:
+        datetime.fromisoformat(date)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="report_date must be ISO formatted")
+
+    ext = os.path.splitext(file.filename or "")[1] or ".pdf"
+    stem = f"{hotel_id}/compliance/{task_id}/{date}_{uuid.uuid4().hex[:8]}"
+    file_key = f"{stem}{ext}"
+    meta_key = f"{stem}.json"
+
+    body = await file.read()
+    s3.put_object(
+        Bucket=BUCKET_NAME,
+        Key=file_key,
+        Body=body,
+        ContentType=file.content_type or "application/pdf",
+        Metadata={"report-date": date},
+    )
+
+    entry = {
+        "report_date": date,
+        "filename": file.filename,
+        "file_key": file_key,
+        "uploaded_by": uploaded_by,
+        "uploaded_at": datetime.utcnow().isoformat(),
+        "approved": False,
+    }
+    s3.put_object(
+        Bucket=BUCKET_NAME,
+        Key=meta_key,
+        Body=orjson.dumps(entry, option=orjson.OPT_INDENT_2),
+        ContentType="application/json",
+        Metadata={"report-date": date},
+    )
+
+    add_history_entry(hotel_id, task_id, entry)
+    logger.debug("Uploaded %s for %s/%s", file.filename, hotel_id, task_id)
+    return {"status": "ok", "file_key": file_key, "report_date": date}
+
+
+def _list_objects(prefix: str):
+    """Yield every object under a prefix, via the paginator.
+
+    A generator keeps one page in memory at a time instead of
+    materializing the whole listing; a bare list_objects_v2 would also
+    silently stop at 1000 keys."""
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(
+        Bucket=BUCKET_NAME, Prefix=prefix, PaginationConfig={"PageSize": 1000}
+    ):
+        for obj in page.get("Contents", []):
+            if not obj["Key"].endswith("/"):
+                yield obj
+
+
+@router.get("/tree/{hotel_id}")
+def get_recursive_file_tree(hotel_id: str):
+    """Folder tree of a hotel's compliance files.
+
+    Nodes carry the object path only; clients resolve a signed URL
+    through the report-url route when a file is actually opened."""
+    keys = [o["Key"] for o in _list_objects(f"{hotel_id}/compliance/")]
+    tree = tree_to_nodes(build_tree(keys))
+    # Encode the Struct tree directly to bytes; the default path walks
+    # the whole structure through jsonable_encoder first.
+    return Response(
+        content=msgspec.json.encode({"hotel_id": hotel_id, "tree": tree}),
+        media_type="application/json",
+    )
+
+
+@router.get("/reports/{hotel_id}/{path:path}")
+def get_report_url(hotel_id: str, path: str):
+    """Signed URL for a single file, generated on demand."""
+    return {"url": generate_signed_url(f"{hotel_id}/{path}")}
+
+
+@router.get("/{hotel_id}")
+def list_service_files(hotel_id: str):
+    """Flat listing of a hotel's compliance files (no signed URLs)."""
+    files = []
+    for obj in _list_objects(f"{hotel_id}/compliance/"):
+        key = obj["Key"]
+        files.append(
+            {
+                "filename": key.rsplit("/", 1)[-1],
+                "path": key,
+                "size": obj["Size"],
+                "last_modified": obj["LastModified"].isoformat(),
+            }
+        )
+    return {"hotel_id": hotel_id, "files": files}
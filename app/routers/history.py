@@ -0,0 +1,176 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from app.utils.compliance_history import (
+    add_history_entry,
+    approve_history_entry,
+    delete_history_entry,
+    delete_history_tasks,
+    get_approval_log,
+    load_compliance_history,
+    load_compliance_history_async,
+    update_approval_log,
+)
+
+# Matrix and leaderboard payloads are large plain-dict structures, so
+# let orjson encode them instead of the stdlib serializer.
+router = APIRouter(
+    prefix="/history", tags=["history"], default_response_class=ORJSONResponse
+)
+
+RULES_PATH = Path(__file__).parent.parent / "data" / "compliance.json"
+
+# The rules file is static, so read and flatten it once at import instead
+# of re-parsing it on every /history/matrix request.
+with open(RULES_PATH) as f:
+    _RULES = json.load(f)
+_ALL_TASKS = tuple(t["task_id"] for s in _RULES for t in s.get("tasks", []))
+
+# id -> display name; a dict gives O(1) name lookup and avoids one
+# throwaway dict per hotel on every request that walks the fleet.
+HOTELS = {
+    "hiex": "Holiday Inn Express",
+    "moxy": "Moxy Cork",
+    "hida": "Holiday Inn Dublin Airport",
+    "hbhdcc": "Hampton by Hilton Dublin City Centre",
+    "sera": "Seraphine Kensington",
+    "marlin": "The Marlin Hotel",
+}
+
+
+def _load_all_histories() -> dict:
+    """Fetch every hotel's history concurrently; the S3 reads are
+    independent so wall time is one GET instead of len(HOTELS)."""
+    with ThreadPoolExecutor(max_workers=len(HOTELS)) as ex:
+        return dict(zip(HOTELS, ex.map(load_compliance_history, HOTELS)))
+
+
+class ApprovalRequest(BaseModel):
+    hotel_id: str
+    task_id: str
+    report_date: str
+    approved_by: str
+
+
+class HistoryEntryRequest(BaseModel):
+    hotel_id: str
+    task_id: str
+    entry: dict
+
+
+class BulkDeleteRequest(BaseModel):
+    hotel_id: str
+    task_ids: list[str]
+
+
+@router.get("/matrix")
+def get_compliance_matrix():
+    """Hotel × task grid of upload status for the admin dashboard."""
+    histories = _load_all_histories()
+    entries = []
+    for hotel_id, hotel_name in HOTELS.items():
+        history = histories[hotel_id]
+        for task_id in _ALL_TASKS:
+            # Single pass: presence and approval are decided together
+            # instead of any() followed by a second truthiness check.
+            status = "missing"
+            for e in history.get(task_id, ()):
+                if e.get("approved"):
+                    status = "done"
+                    break
+                status = "pending"
+            entries.append(
+                {
+                    "hotel_id": hotel_id,
+                    "hotel_name": hotel_name,
+                    "task_id": task_id,
+                    "status": status,
+                }
+            )
+    return {"entries": entries}
+
+
+@router.get("/leaderboard")
+async def get_compliance_leaderboard():
+    """Approved-entry counts per hotel, best first."""
+    loaded = await asyncio.gather(
+        *(load_compliance_history_async(hotel_id) for hotel_id in HOTELS)
+    )
+    board = []
+    for (hotel_id, hotel_name), history in zip(HOTELS.items(), loaded):
+        approved = sum(
+            1
+            for task_entries in history.values()
+            for e in task_entries
+            if e.get("approved")
+        )
+        board.append(
+            {"hotel_id": hotel_id, "hotel_name": hotel_name, "approved": approved}
+        )
+    board.sort(key=lambda h: h["approved"], reverse=True)
+    return {"leaderboard": board}
+
+
+@router.get("/approvals")
+def list_approvals():
+    return {"approvals": get_approval_log()}
+
+
+@router.get("/{hotel_id}")
+async def get_compliance_history(hotel_id: str):
+    history = await load_compliance_history_async(hotel_id)
+    return {"hotel_id": hotel_id, "history": history}
+
+
+@router.post("/entry")
+def post_history_entry(payload: HistoryEntryRequest):
+    add_history_entry(payload.hotel_id, payload.task_id, payload.entry)
+    return {"ok": True}
+
+
+@router.post("/approve")
+def approve_compliance_entry(payload: ApprovalRequest):
+    approved = approve_history_entry(
+        payload.hotel_id, payload.task_id, payload.report_date, payload.approved_by
+    )
+    if not approved:
+        raise HTTPException(status_code=404, detail="Entry not found")
+    update_approval_log(
+        "add",
+        {
+            "hotel_id": payload.hotel_id,
+            "task_id": payload.task_id,
+            "report_date": payload.report_date,
+            "approved_by": payload.approved_by,
+        },
+    )
+    return {"ok": True}
+
+
+@router.post("/delete-tasks")
+def delete_history_for_tasks(payload: BulkDeleteRequest):
+    """Drop entire task histories in one batched S3 call."""
+    result = delete_history_tasks(payload.hotel_id, payload.task_ids)
+    return {"ok": not result["errors"], **result}
+
+
+@router.delete("/{hotel_id}/{task_id}/{filename}")
+def delete_history(hotel_id: str, task_id: str, filename: str):
+    removed = delete_history_entry(hotel_id, task_id, filename)
+    if removed is None:
+        raise HTTPException(status_code=404, detail="Entry not found")
+    update_approval_log(
+        "remove",
+        {
+            "hotel_id": hotel_id,
+            "task_id": task_id,
+            "report_date": removed.get("report_date"),
+        },
+    )
+    return {"ok": True}
@@ -0,0 +1,387 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict
+
+import orjson
+from botocore.exceptions import ClientError
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+
+from app.utils import aws
+from app.utils.cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+BUCKET_NAME = os.getenv("AWS_BUCKET_NAME", "jmk-fm-reports")
+
+router = APIRouter(prefix="/facilities", tags=["facilities"])
+
+HOTEL_IDS = ["hiex", "moxy", "hida", "hbhdcc", "sera", "marlin"]
+
+# Facility blobs change on setup edits, not on reads; the tiered cache
+# serves hot hotels from memory (and a shared Redis tier when REDIS_URL
+# is set) and save handlers invalidate their key. ETags are kept past
+# the TTL so an expired entry revalidates with a conditional GET (304,
+# no body) instead of a full re-download.
+_facility_cache = TieredCache(maxsize=256, ttl=300)
+_etags = {}
+
+
+def _cache_key(key: str) -> str:
+    return "fm:blob:" + key
+
+
+async def _cached_get_bytes(key: str) -> bytes:
+    """Read one object's raw JSON bytes through the TTL cache.
+
+    Bytes rather than parsed dicts: GET handlers splice the blob into
+    their response envelope verbatim, so the common path never parses
+    or re-serializes at all."""
+    data = await _facility_cache.get(_cache_key(key))
+    if data is not None:
+        return data
+
+    etag, stale = _etags.get(key, (None, None))
+    kwargs = {"IfNoneMatch": etag} if etag else {}
+    try:
+        obj = await aws.aio_s3.get_object(Bucket=BUCKET_NAME, Key=key, **kwargs)
+    except ClientError as err:
+        if err.response.get("ResponseMetadata", {}).get("HTTPStatusCode") == 304:
+            await _facility_cache.set(_cache_key(key), stale)
+            return stale
+        raise
+
+    data = await obj["Body"].read()
+    _etags[key] = (obj.get("ETag"), data)
+    await _facility_cache.set(_cache_key(key), data)
+    return data
+
+
+async def _cached_get_json(key: str):
+    """Parsed view of a cached blob, for paths that inspect fields."""
+    return orjson.loads(await _cached_get_bytes(key))
+
+
+def _splice(hotel_id: str, field: bytes, body: bytes) -> Response:
+    """Wrap stored JSON bytes in a response envelope without parsing.
+
+    The blob is already the JSON we would emit; orjson.dumps on the
+    hotel_id keeps the spliced string properly escaped."""
+    return Response(
+        content=b'{"hotel_id":' + orjson.dumps(hotel_id) + b',' + field + b":" + body + b"}",
+        media_type="application/json",
+    )
+
+
+async def _invalidate(key: str):
+    await _facility_cache.delete(_cache_key(key))
+    _etags.pop(key, None)
+
+
+# Built once instead of reallocating the 10-field shape on every cold
+# GET; consumers treat loaded facility dicts as read-only, so sharing
+# the empty sub-dicts is safe.
+_EMPTY_FACILITIES = {
+    "hotelId": "",
+    "hotelName": "",
+    "setupComplete": False,
+    "lastUpdated": "",
+    "updatedBy": "",
+    "structural": {},
+    "fireSafety": {},
+    "mechanical": {},
+    "utilities": {},
+    "compliance": {},
+}
+
+
+_SAVE_ATTEMPTS = 3
+
+
+async def _merge_save(key: str, partial: dict, metadata_for=None) -> dict:
+    """Merge a partial payload into the stored blob under an ETag guard.
+
+    Clients send only changed fields; the read-merge-write cycle is
+    fenced with IfMatch so two concurrent saves can't silently drop each
+    other's fields, retrying on PreconditionFailed like the history
+    writers do."""
+    for attempt in range(_SAVE_ATTEMPTS):
+        existing = {}
+        etag = None
+        try:
+            obj = await aws.aio_s3.get_object(Bucket=BUCKET_NAME, Key=key)
+            existing = orjson.loads(await obj["Body"].read())
+            etag = obj.get("ETag")
+        except aws.aio_s3.exceptions.NoSuchKey:
+            pass
+
+        existing.update(partial)
+        kwargs = {}
+        if etag:
+            kwargs["IfMatch"] = etag
+        if metadata_for is not None:
+            kwargs["Metadata"] = metadata_for(existing)
+        try:
+            await aws.aio_s3.put_object(
+                Bucket=BUCKET_NAME,
+                Key=key,
+                Body=orjson.dumps(existing),
+                ContentType="application/json",
+                **kwargs,
+            )
+            return existing
+        except ClientError as err:
+            code = err.response.get("Error", {}).get("Code")
+            if code != "PreconditionFailed" or attempt == _SAVE_ATTEMPTS - 1:
+                raise
+            logger.warning("Concurrent save on %s, retrying", key)
+
+
+async def _load_facilities(hotel_id: str) -> dict:
+    """Facility dict for one hotel; empty-setup shape when none saved.
+
+    Shared by the single-hotel GET and the summary so the summary never
+    routes through the handler and pays a serialize-then-reparse."""
+    try:
+        return await _cached_get_json(get_facilities_key(hotel_id))
+    except aws.aio_s3.exceptions.NoSuchKey:
+        return {**_EMPTY_FACILITIES, "hotelId": hotel_id}
+
+
+# The facility/details payloads are opaque nested dicts the frontend
+# round-trips; Pydantic models over Dict[str, Any] sections validated
+# nothing real while walking every node. Saves read the raw body and
+# check just the top-level scalars by hand.
+_STRING_FIELDS = ("hotelName", "lastUpdated", "updatedBy")
+
+
+async def _read_body_dict(request: Request) -> dict:
+    try:
+        data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=422, detail="Body must be valid JSON")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=422, detail="Body must be a JSON object")
+    for field in _STRING_FIELDS:
+        if field in data and not isinstance(data[field], str):
+            raise HTTPException(status_code=422, detail=f"{field} must be a string")
+    return data
+
+
+# Bound str.format slots run at C level; an f-string helper re-parses
+# the literal on every call. Same names, now call-through templates.
+get_facilities_key = "hotels/facilities/{}.json".format
+get_details_key = "hotels/details/{}.json".format
+get_compliance_key = "hotels/compliance/{}.json".format
+get_compliance_tasks_key = "hotels/facilities/{}/tasks.json".format
+
+
+def _empty_summary_row(hotel_id: str) -> dict:
+    return {
+        "hotel_id": hotel_id,
+        "hotelName": "",
+        "setupComplete": False,
+        "lastUpdated": "",
+    }
+
+
+async def _summary_row(hotel_id: str) -> dict:
+    """One summary row from object user-metadata alone.
+
+    Saves stamp the three summary fields into metadata, so HeadObject
+    answers with ~200 bytes of headers and no JSON body; facility blobs
+    written before stamping fall back to the full load once."""
+    try:
+        head = await aws.aio_s3.head_object(
+            Bucket=BUCKET_NAME, Key=get_facilities_key(hotel_id)
+        )
+    except ClientError as err:
+        if err.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return _empty_summary_row(hotel_id)
+        raise
+
+    meta = head.get("Metadata", {})
+    if "last-updated" in meta:
+        return {
+            "hotel_id": hotel_id,
+            "hotelName": meta.get("hotel-name", ""),
+            "setupComplete": meta.get("setup-complete") == "1",
+            "lastUpdated": meta.get("last-updated", ""),
+        }
+
+    facilities = await _load_facilities(hotel_id)
+    return {
+        "hotel_id": hotel_id,
+        "hotelName": facilities.get("hotelName", ""),
+        "setupComplete": facilities.get("setupComplete", False),
+        "lastUpdated": facilities.get("lastUpdated", ""),
+    }
+
+
+@router.get("/summary/all")
+async def get_all_facilities_summary():
+    """Setup status for every hotel, for the portfolio dashboard.
+
+    One listing of the facilities prefix decides which hotels have a
+    blob at all, so unset hotels cost nothing and only present ones get
+    a (gathered) metadata HeadObject."""
+    prefix = "hotels/facilities/"
+    paginator = aws.aio_s3.get_paginator("list_objects_v2")
+    present = set()
+    async for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            name = obj["Key"][len(prefix):]
+            # Per-hotel artifacts like {hotel_id}/tasks.json share the
+            # prefix; only bare {hotel_id}.json keys are facility blobs.
+            if name.endswith(".json") and "/" not in name:
+                present.add(name[:-5])
+
+    hotels_present = [h for h in HOTEL_IDS if h in present]
+    results = await asyncio.gather(
+        *(_summary_row(h) for h in hotels_present), return_exceptions=True
+    )
+    rows = dict(zip(hotels_present, results))
+
+    summary = []
+    for hotel_id in HOTEL_IDS:
+        row = rows.get(hotel_id)
+        if row is None:
+            row = _empty_summary_row(hotel_id)
+        elif isinstance(row, Exception):
+            logger.warning("Summary failed for %s: %s", hotel_id, row)
+            row = _empty_summary_row(hotel_id)
+        summary.append(row)
+    return {"summary": summary}
+
+
+@router.get("/{hotel_id}")
+async def get_hotel_facilities(hotel_id: str):
+    """Facilities setup data for one hotel."""
+    try:
+        body = await _cached_get_bytes(get_facilities_key(hotel_id))
+    except aws.aio_s3.exceptions.NoSuchKey:
+        return ORJSONResponse(
+            {"hotel_id": hotel_id, "facilities": {**_EMPTY_FACILITIES, "hotelId": hotel_id}}
+        )
+    except Exception:
+        logger.exception("Error loading facilities for %s", hotel_id)
+        raise HTTPException(status_code=500, detail="Failed to load facilities")
+    return _splice(hotel_id, b'"facilities"', body)
+
+
+@router.post("/{hotel_id}")
+async def save_hotel_facilities(hotel_id: str, request: Request):
+    """Persist facilities setup data for one hotel."""
+    data = await _read_body_dict(request)
+    # %-style args defer the payload repr unless DEBUG is enabled.
+    logger.debug("Saving facilities for %s: %s", hotel_id, data)
+    data["hotelId"] = hotel_id
+    data["lastUpdated"] = datetime.utcnow().isoformat()
+    try:
+        # Summary metadata is stamped from the merged blob inside the
+        # same conditional PUT, so a partial save can't blank it.
+        await _merge_save(
+            get_facilities_key(hotel_id),
+            data,
+            metadata_for=lambda merged: {
+                "hotel-name": merged.get("hotelName", "") or "",
+                "setup-complete": "1" if merged.get("setupComplete") else "0",
+                "last-updated": merged["lastUpdated"],
+            },
+        )
+        await _invalidate(get_facilities_key(hotel_id))
+        logger.debug("Facilities saved for %s", hotel_id)
+        return {"status": "ok", "hotel_id": hotel_id}
+    except Exception:
+        logger.exception("Error saving facilities for %s", hotel_id)
+        raise HTTPException(status_code=500, detail="Failed to save facilities")
+
+
+@router.get("/{hotel_id}/details")
+async def get_hotel_details(hotel_id: str):
+    """Hotel profile details (address, contacts, building info)."""
+    try:
+        body = await _cached_get_bytes(get_details_key(hotel_id))
+    except aws.aio_s3.exceptions.NoSuchKey:
+        return {"hotel_id": hotel_id, "details": {}}
+    except Exception:
+        logger.exception("Error loading details for %s", hotel_id)
+        raise HTTPException(status_code=500, detail="Failed to load details")
+    return _splice(hotel_id, b'"details"', body)
+
+
+@router.post("/{hotel_id}/details")
+async def save_hotel_details(hotel_id: str, request: Request):
+    logger.debug("Saving details for %s", hotel_id)
+    data = await _read_body_dict(request)
+    data["hotelId"] = hotel_id
+    try:
+        await _merge_save(get_details_key(hotel_id), data)
+        await _invalidate(get_details_key(hotel_id))
+        logger.debug("Details saved for %s", hotel_id)
+        return {"status": "ok", "hotel_id": hotel_id}
+    except Exception:
+        logger.exception("Error saving details for %s", hotel_id)
+        raise HTTPException(status_code=500, detail="Failed to save details")
+
+
+@router.get("/{hotel_id}/compliance")
+async def get_hotel_compliance(hotel_id: str):
+    """Per-hotel compliance configuration overrides."""
+    try:
+        body = await _cached_get_bytes(get_compliance_key(hotel_id))
+    except aws.aio_s3.exceptions.NoSuchKey:
+        return {"hotel_id": hotel_id, "compliance": {}}
+    except Exception:
+        logger.exception("Error loading compliance for %s", hotel_id)
+        raise HTTPException(status_code=500, detail="Failed to load compliance")
+    return _splice(hotel_id, b'"compliance"', body)
+
+
+@router.post("/{hotel_id}/compliance")
+async def save_hotel_compliance(hotel_id: str, compliance_data: Dict[str, Any]):
+    logger.debug("Saving compliance for %s", hotel_id)
+    try:
+        await aws.aio_s3.put_object(
+            Bucket=BUCKET_NAME,
+            Key=get_compliance_key(hotel_id),
+            Body=orjson.dumps(compliance_data),
+            ContentType="application/json",
+        )
+        await _invalidate(get_compliance_key(hotel_id))
+        return {"status": "ok", "hotel_id": hotel_id}
+    except Exception:
+        logger.exception("Error saving compliance for %s", hotel_id)
+        raise HTTPException(status_code=500, detail="Failed to save compliance")
+
+
+@router.get("/{hotel_id}/tasks")
+async def get_compliance_tasks(hotel_id: str):
+    """Which compliance tasks apply to this hotel."""
+    try:
+        body = await _cached_get_bytes(get_compliance_tasks_key(hotel_id))
+    except aws.aio_s3.exceptions.NoSuchKey:
+        return {"hotel_id": hotel_id, "tasks": {}}
+    except Exception:
+        logger.exception("Error loading tasks for %s", hotel_id)
+        raise HTTPException(status_code=500, detail="Failed to load tasks")
+    return _splice(hotel_id, b'"tasks"', body)
+
+
+@router.post("/{hotel_id}/tasks")
+async def save_compliance_tasks(hotel_id: str, tasks_data: Dict[str, Any]):
+    logger.debug("Saving tasks for %s", hotel_id)
+    try:
+        await aws.aio_s3.put_object(
+            Bucket=BUCKET_NAME,
+            Key=get_compliance_tasks_key(hotel_id),
+            Body=orjson.dumps(tasks_data),
+            ContentType="application/json",
+        )
+        await _invalidate(get_compliance_tasks_key(hotel_id))
+        return {"status": "ok", "hotel_id": hotel_id}
+    except Exception:
+        logger.exception("Error saving tasks for %s", hotel_id)
+        raise HTTPException(status_code=500, detail="Failed to save tasks")
@@ -0,0 +1,300 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+
+import orjson
+from botocore.exceptions import ClientError
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Response
+from pydantic import BaseModel
+
+from app.routers.hotel_facilities import _load_facilities
+from app.utils import aws
+from app.utils.cache import TieredCache
+from app.utils.rules import confirmation_specs, task_specs
+
+logger = logging.getLogger(__name__)
+
+BUCKET_NAME = os.getenv("AWS_BUCKET_NAME", "jmk-fm-reports")
+
+router = APIRouter(prefix="/monthly-checklist", tags=["monthly-checklist"])
+
+# Checklist responses are identical for every viewer of a hotel within
+# a month, so the serialized payload is cached for a minute and dropped
+# the moment a confirmation lands.
+_checklist_cache = TieredCache(maxsize=64, ttl=60)
+
+
+def _checklist_cache_key(hotel_id: str, month_key: str) -> str:
+    return f"fm:conf:{hotel_id}:{month_key}"
+
+
+def confirmations_prefix(hotel_id: str) -> str:
+    # Deliberately outside {hotel_id}/compliance/ — that prefix is the
+    # uploads namespace, where listings treat every folder as a task id.
+    return f"{hotel_id}/confirmations/"
+
+
+def _month_confirmation_key(hotel_id: str, task_id: str, month_key: str) -> str:
+    return f"{confirmations_prefix(hotel_id)}{task_id}/{month_key}.json"
+
+
+class ConfirmTaskRequest(BaseModel):
+    hotel_id: str
+    task_id: str
+    confirmed_by: str
+
+
+# Facility capabilities packed into one int per request; each
+# equipment-bound task carries the mask of bits it requires, so
+# applicability is a single AND per task instead of a predicate call
+# walking nested dicts. Tasks without a mask (statutory duties and the
+# monthly confirmations) require 0 bits and always pass.
+_HAS_FIRE_ALARM = 1 << 0
+_HAS_EXTINGUISHERS = 1 << 1
+_HAS_EMERGENCY_LIGHTING = 1 << 2
+_HAS_TMV = 1 << 3
+_HAS_CALORIFIER = 1 << 4
+_HAS_THREE_PHASE = 1 << 5
+_HAS_GAS = 1 << 6
+_HAS_LIFTS = 1 << 7
+_HAS_KITCHEN = 1 << 8
+_HAS_ANSUL = 1 << 9
+_HAS_POOL = 1 << 10
+
+TASK_MASKS = {
+    "fire_alarm_service_certificate": _HAS_FIRE_ALARM,
+    "fire_extinguisher_certificate": _HAS_EXTINGUISHERS,
+    "emergency_lighting_certificate": _HAS_EMERGENCY_LIGHTING,
+    "tmv_service_certificate": _HAS_TMV,
+    "calorifier_inspection": _HAS_CALORIFIER,
+    "thermal_imaging_survey": _HAS_THREE_PHASE,
+    "gas_safety_certificate": _HAS_GAS,
+    "kitchen_gas_interlock_test": _HAS_GAS | _HAS_KITCHEN,
+    "lift_service_certificate": _HAS_LIFTS,
+    "lift_insurance_inspection": _HAS_LIFTS,
+    "kitchen_extract_cleaning": _HAS_KITCHEN,
+    "ansul_system_service": _HAS_ANSUL,
+    "grease_trap_cleaning": _HAS_KITCHEN,
+    "pool_water_testing": _HAS_POOL,
+    "pool_plant_inspection": _HAS_POOL,
+}
+
+
+def capabilities_of(facility_data: dict) -> int:
+    """Pack the facilities setup into a capability bitset, read once."""
+    fire = facility_data.get("fireSafety", {})
+    util = facility_data.get("utilities", {})
+    mech = facility_data.get("mechanical", {})
+    struct = facility_data.get("structural", {})
+    caps = 0
+    if fire.get("fireAlarmSystem"):
+        caps |= _HAS_FIRE_ALARM
+    if fire.get("fireExtinguishers", 0) > 0:
+        caps |= _HAS_EXTINGUISHERS
+    if fire.get("emergencyLighting"):
+        caps |= _HAS_EMERGENCY_LIGHTING
+    if util.get("tmvValves", 0) > 0:
+        caps |= _HAS_TMV
+    if util.get("calorifiers", 0) > 0:
+        caps |= _HAS_CALORIFIER
+    if util.get("threePhasePower"):
+        caps |= _HAS_THREE_PHASE
+    if util.get("gasSupply"):
+        caps |= _HAS_GAS
+    if mech.get("lifts", 0) > 0:
+        caps |= _HAS_LIFTS
+    if struct.get("commercialKitchen"):
+        caps |= _HAS_KITCHEN
+    if mech.get("ansulSystem"):
+        caps |= _HAS_ANSUL
+    if struct.get("swimmingPool"):
+        caps |= _HAS_POOL
+    return caps
+
+
+def generate_applicable_tasks(facility_data: dict) -> list:
+    """Filter the compliance rules to tasks this hotel's setup requires."""
+    caps = capabilities_of(facility_data)
+    applicable = []
+    append = applicable.append
+    get_mask = TASK_MASKS.get
+    for spec in task_specs():
+        mask = get_mask(spec.task_id, 0)
+        if caps & mask == mask:
+            append(
+                {
+                    "task_id": spec.task_id,
+                    "label": spec.label,
+                    "category": spec.section,
+                    "frequency": spec.frequency,
+                    "type": spec.type,
+                    "needs_report": spec.needs_report,
+                    "points": spec.points,
+                    "info_popup": spec.info_popup,
+                    "section": spec.section,
+                }
+            )
+    return applicable
+
+
+@router.get("/applicable/{hotel_id}")
+async def get_applicable_tasks(hotel_id: str):
+    """Compliance tasks that apply to this hotel's facilities setup."""
+    try:
+        facility_data = await _load_facilities(hotel_id)
+        tasks = generate_applicable_tasks(facility_data)
+        return {"hotel_id": hotel_id, "tasks": tasks}
+    except Exception:
+        logger.exception("Error generating applicable tasks for %s", hotel_id)
+        raise HTTPException(status_code=500, detail="Failed to generate tasks")
+
+
+async def _latest_confirmation(hotel_id: str, task_id: str, month_keys):
+    """(key, LastModified) of the newest monthly record, or (None, None).
+
+    Confirmations live at one deterministic key per month, so existence
+    is a direct HeadObject — no listing, O(1) however much history a
+    task accumulates."""
+    for month_key in month_keys:
+        key = _month_confirmation_key(hotel_id, task_id, month_key)
+        try:
+            head = await aws.aio_s3.head_object(Bucket=BUCKET_NAME, Key=key)
+        except ClientError as err:
+            if err.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                continue
+            raise
+        return key, head["LastModified"]
+    return None, None
+
+
+def _checklist_row(spec, last_confirmed, month_key: str) -> dict:
+    """One checklist entry from HEAD metadata alone.
+
+    A confirmation object's LastModified is its confirmation time, so
+    existence plus recency answers is_confirmed without downloading the
+    record body."""
+    return {
+        "task_id": spec.task_id,
+        "label": spec.label,
+        "frequency": spec.frequency,
+        "category": spec.section,
+        "info_popup": spec.info_popup,
+        "is_confirmed": bool(last_confirmed) and last_confirmed.startswith(month_key),
+        "last_confirmed": last_confirmed,
+        "confirmed_by": None,
+    }
+
+
+async def _confirmed_by(key: str):
+    obj = await aws.aio_s3.get_object(Bucket=BUCKET_NAME, Key=key)
+    return orjson.loads(await obj["Body"].read()).get("confirmed_by")
+
+
+@router.get("/{hotel_id}")
+async def get_monthly_checklist(hotel_id: str, include_confirmed_by: bool = False):
+    """Monthly confirmation tasks with their confirmed-this-month state.
+
+    Record bodies hold nothing the listing doesn't except confirmed_by,
+    so they are only fetched (concurrently) when the caller asks."""
+    # One utcnow per request; month keys come from f-strings rather than
+    # a strftime round trip per use.
+    now = datetime.utcnow()
+    month_key = f"{now.year:04d}-{now.month:02d}"
+    try:
+        if not include_confirmed_by:
+            cached = await _checklist_cache.get(_checklist_cache_key(hotel_id, month_key))
+            if cached is not None:
+                return Response(content=cached, media_type="application/json")
+        prev = now.replace(day=1) - timedelta(days=1)
+        prev_month_key = f"{prev.year:04d}-{prev.month:02d}"
+        specs = confirmation_specs()
+        heads = await asyncio.gather(
+            *(
+                _latest_confirmation(hotel_id, spec.task_id, (month_key, prev_month_key))
+                for spec in specs
+            )
+        )
+        checklist = []
+        fetchable = []
+        for spec, (key, modified) in zip(specs, heads):
+            last_confirmed = (
+                modified.strftime("%Y-%m-%dT%H:%M:%SZ") if modified else None
+            )
+            row = _checklist_row(spec, last_confirmed, month_key)
+            checklist.append(row)
+            if key is not None:
+                fetchable.append((row, key))
+        if include_confirmed_by and fetchable:
+            names = await asyncio.gather(
+                *(_confirmed_by(key) for _, key in fetchable)
+            )
+            for (row, _), name in zip(fetchable, names):
+                row["confirmed_by"] = name
+        payload = {"hotel_id": hotel_id, "month": month_key, "tasks": checklist}
+        if not include_confirmed_by:
+            await _checklist_cache.set(
+                _checklist_cache_key(hotel_id, month_key), orjson.dumps(payload)
+            )
+        return payload
+    except Exception:
+        logger.exception("Error building checklist for %s", hotel_id)
+        raise HTTPException(status_code=500, detail="Failed to load checklist")
+
+
+async def _persist_confirmation(hotel_id: str, month: str, keys, body: bytes):
+    """Write-behind for a confirmation: both PUTs, then drop the cached
+    checklist so the next read sees the new record."""
+    try:
+        await asyncio.gather(
+            *(
+                aws.aio_s3.put_object(
+                    Bucket=BUCKET_NAME,
+                    Key=k,
+                    Body=body,
+                    ContentType="application/json",
+                )
+                for k in keys
+            )
+        )
+        await _checklist_cache.delete(_checklist_cache_key(hotel_id, month))
+        logger.debug("Confirmation recorded at %s", keys[0])
+    except Exception:
+        logger.exception("Error persisting confirmation at %s", keys[0])
+
+
+@router.post("/confirm")
+async def confirm_task(payload: ConfirmTaskRequest, background: BackgroundTasks):
+    """Record a monthly confirmation for one task.
+
+    The current month's record lives at one deterministic key, so a
+    re-confirmation overwrites in place and readers HEAD it directly;
+    an append-only copy under history/ keeps the audit trail. The PUTs
+    run after the response is sent — a sign-off is idempotent and
+    repeatable, so the user shouldn't wait on S3 durability for it."""
+    now = datetime.utcnow()
+    month = f"{now.year:04d}-{now.month:02d}"
+    timestamp = (
+        f"{now.year:04d}{now.month:02d}{now.day:02d}"
+        f"{now.hour:02d}{now.minute:02d}{now.second:02d}"
+    )
+    key = _month_confirmation_key(payload.hotel_id, payload.task_id, month)
+    history_key = (
+        f"{confirmations_prefix(payload.hotel_id)}{payload.task_id}/"
+        f"history/{timestamp}.json"
+    )
+    record = {
+        "hotel_id": payload.hotel_id,
+        "task_id": payload.task_id,
+        "confirmed_by": payload.confirmed_by,
+        "confirmed_at": now.isoformat(timespec="seconds") + "Z",
+        "month": month,
+    }
+    background.add_task(
+        _persist_confirmation,
+        payload.hotel_id,
+        month,
+        (key, history_key),
+        orjson.dumps(record),
+    )
+    return {"status": "ok", "key": key}
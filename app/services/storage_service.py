@@ -0,0 +1,28 @@
+import functools
+import logging
+import os
+import time
+
+from app.utils.aws import s3
+
+logger = logging.getLogger(__name__)
+
+BUCKET_NAME = os.getenv("AWS_BUCKET_NAME", "jmk-fm-reports")
+
+
+@functools.lru_cache(maxsize=16384)
+def _signed(key: str, expires_in: int, hour_bucket: int) -> str:
+    return s3.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": BUCKET_NAME, "Key": key},
+        ExpiresIn=expires_in,
+    )
+
+
+def generate_signed_url(key: str, expires_in: int = 3600) -> str:
+    """Presigned GET URL for one object.
+
+    Signing the same key repeatedly inside its expiry window is
+    identical HMAC work, so results are memoized per half-hour bucket;
+    the bucket rolls over well before the hour-long URLs expire."""
+    return _signed(key, expires_in, int(time.time()) // 1800)
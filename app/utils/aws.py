@@ -0,0 +1,32 @@
+import os
+
+import aioboto3
+import boto3
+from botocore.config import Config
+
+# Adaptive retry mode rate-limits client-side when S3 starts returning
+# slowdowns, which suits the bursty fan-outs the routers now issue.
+_CONFIG = Config(
+    max_pool_connections=64,
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    tcp_keepalive=True,
+)
+
+_REGION = os.getenv("AWS_REGION", "eu-west-1")
+
+# One shared S3 client for the whole app. The default botocore pool of 10
+# connections would serialize the parallel per-hotel fetches, so it is
+# raised here, and creating the client once avoids re-walking the
+# credential chain in every module that needs S3.
+s3 = boto3.client("s3", region_name=_REGION, config=_CONFIG)
+
+# Async counterpart, opened once for the process by the app lifespan in
+# app.main and published here; async handlers must not touch it before
+# startup completes.
+session = aioboto3.Session()
+aio_s3 = None
+
+
+def aio_client_ctx():
+    """Context manager for the shared async S3 client (used by the lifespan)."""
+    return session.client("s3", region_name=_REGION, config=_CONFIG)
@@ -0,0 +1,70 @@
+"""Two-tier byte cache: in-process TTL L1 over an optional Redis L2.
+
+Single-instance deployments get the same in-process TTLCache behaviour
+as before with no Redis running; setting REDIS_URL (and installing
+redis) adds a shared tier so multiple workers see each other's cache
+fills and invalidations. Redis failures degrade to L1 with a warning —
+a cache outage must never fail a request.
+
+Keys follow the fm:{entity}:{id}[:{variant}] shape.
+"""
+
+import logging
+import os
+
+from cachetools import TTLCache
+
+try:
+    import redis.asyncio as _redis_asyncio
+except ImportError:  # optional dependency
+    _redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+_REDIS_URL = os.getenv("REDIS_URL")
+_client = (
+    _redis_asyncio.from_url(_REDIS_URL)
+    if _redis_asyncio is not None and _REDIS_URL
+    else None
+)
+
+
+class TieredCache:
+    """Async get/set/delete over bytes values with a per-tier TTL."""
+
+    def __init__(self, maxsize: int = 256, ttl: int = 60):
+        self._l1 = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._ttl = ttl
+
+    async def get(self, key: str):
+        value = self._l1.get(key)
+        if value is not None:
+            return value
+        if _client is None:
+            return None
+        try:
+            value = await _client.get(key)
+        except Exception as err:
+            logger.warning("Redis get failed for %s: %s", key, err)
+            return None
+        if value is not None:
+            self._l1[key] = value
+        return value
+
+    async def set(self, key: str, value: bytes):
+        self._l1[key] = value
+        if _client is None:
+            return
+        try:
+            await _client.setex(key, self._ttl, value)
+        except Exception as err:
+            logger.warning("Redis set failed for %s: %s", key, err)
+
+    async def delete(self, key: str):
+        self._l1.pop(key, None)
+        if _client is None:
+            return
+        try:
+            await _client.delete(key)
+        except Exception as err:
+            logger.warning("Redis delete failed for %s: %s", key, err)
@@ -0,0 +1,304 @@
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+
+from botocore.exceptions import ClientError
+
+from app.utils.aws import s3
+from app.utils.compliance_index import remove_tasks_from_index, update_compliance_index
+from app.utils.score_cache import invalidate_score
+
+logger = logging.getLogger(__name__)
+
+BUCKET_NAME = os.getenv("AWS_BUCKET_NAME", "jmk-fm-reports")
+APPROVAL_LOG_KEY = "logs/approvals/approval-log.json"
+
+MAX_ENTRIES_PER_TASK = 50
+
+# Attempts for the optimistic read-modify-write loop on history mutations.
+_RMW_ATTEMPTS = 3
+
+_FETCH_WORKERS = 16
+
+
+def _is_precondition_failed(err: ClientError) -> bool:
+    return err.response.get("Error", {}).get("Code") == "PreconditionFailed"
+
+
+def history_prefix(hotel_id: str) -> str:
+    return f"logs/compliance-history/{hotel_id}/"
+
+
+def task_key(hotel_id: str, task_id: str) -> str:
+    return f"logs/compliance-history/{hotel_id}/{task_id}.json"
+
+
+def legacy_history_key(hotel_id: str) -> str:
+    return f"logs/compliance-history/{hotel_id}.json"
+
+
+def _task_id_from_key(key: str) -> str:
+    return key.rsplit("/", 1)[-1][: -len(".json")]
+
+
+def load_task_entries_with_etag(hotel_id: str, task_id: str):
+    """Load one task's entry list plus its ETag for conditional writes."""
+    try:
+        obj = s3.get_object(Bucket=BUCKET_NAME, Key=task_key(hotel_id, task_id))
+        return orjson.loads(obj["Body"].read()), obj.get("ETag")
+    except s3.exceptions.NoSuchKey:
+        return [], None
+
+
+def save_compliance_task(hotel_id: str, task_id: str, entries: list, etag: str = None):
+    """Write one task's entry list; with an ETag the PUT is conditional, so
+    a concurrent writer triggers PreconditionFailed instead of a lost update."""
+    kwargs = {}
+    if etag:
+        kwargs["IfMatch"] = etag
+    s3.put_object(
+        Bucket=BUCKET_NAME,
+        Key=task_key(hotel_id, task_id),
+        Body=json.dumps(entries, indent=2),
+        ContentType="application/json",
+        **kwargs,
+    )
+    logger.debug("Saved compliance task %s/%s", hotel_id, task_id)
+
+
+def _list_task_keys(hotel_id: str) -> list:
+    paginator = s3.get_paginator("list_objects_v2")
+    keys = []
+    for page in paginator.paginate(Bucket=BUCKET_NAME, Prefix=history_prefix(hotel_id)):
+        keys.extend(o["Key"] for o in page.get("Contents", []))
+    return keys
+
+
+def _load_legacy_history(hotel_id: str) -> dict:
+    """Read the pre-split monolithic history object, if any."""
+    try:
+        obj = s3.get_object(Bucket=BUCKET_NAME, Key=legacy_history_key(hotel_id))
+        return orjson.loads(obj["Body"].read())
+    except s3.exceptions.NoSuchKey:
+        return {}
+
+
+def load_compliance_history(hotel_id: str) -> dict:
+    """Aggregate the per-task objects into {task_id: [entry, ...]}.
+
+    History is stored one object per task so single-task writes upload
+    kilobytes instead of the whole file; reads list the hotel prefix and
+    fetch the task objects in parallel.
+    """
+    keys = _list_task_keys(hotel_id)
+    if not keys:
+        return _load_legacy_history(hotel_id)
+
+    def fetch(key):
+        obj = s3.get_object(Bucket=BUCKET_NAME, Key=key)
+        return orjson.loads(obj["Body"].read())
+
+    with ThreadPoolExecutor(max_workers=min(_FETCH_WORKERS, len(keys))) as ex:
+        loaded = ex.map(fetch, keys)
+        history = {_task_id_from_key(k): entries for k, entries in zip(keys, loaded)}
+    logger.debug("Loaded compliance history for %s (%d tasks)", hotel_id, len(history))
+    return history
+
+
+async def load_compliance_history_async(hotel_id: str) -> dict:
+    """Async variant of load_compliance_history for event-loop handlers."""
+    from app.utils import aws
+
+    paginator = aws.aio_s3.get_paginator("list_objects_v2")
+    keys = []
+    async for page in paginator.paginate(
+        Bucket=BUCKET_NAME, Prefix=history_prefix(hotel_id)
+    ):
+        keys.extend(o["Key"] for o in page.get("Contents", []))
+    if not keys:
+        try:
+            obj = await aws.aio_s3.get_object(
+                Bucket=BUCKET_NAME, Key=legacy_history_key(hotel_id)
+            )
+            return orjson.loads(await obj["Body"].read())
+        except aws.aio_s3.exceptions.NoSuchKey:
+            return {}
+
+    async def fetch(key):
+        obj = await aws.aio_s3.get_object(Bucket=BUCKET_NAME, Key=key)
+        return orjson.loads(await obj["Body"].read())
+
+    loaded = await asyncio.gather(*(fetch(k) for k in keys))
+    history = {_task_id_from_key(k): entries for k, entries in zip(keys, loaded)}
+    logger.debug("Loaded compliance history for %s (%d tasks)", hotel_id, len(history))
+    return history
+
+
+def _entry_key(entry: dict) -> tuple:
+    return (entry.get("report_date"), entry.get("filename"))
+
+
+_UNCHANGED = object()
+
+
+def _mutate_task(hotel_id: str, task_id: str, mutate):
+    """Optimistic read-modify-write on one task's entry list.
+
+    *mutate* takes the entry list and returns (entries, result), or
+    ``_UNCHANGED`` to skip the write. On a concurrent write the
+    conditional PUT fails and the whole cycle retries on a fresh read.
+    """
+    for attempt in range(_RMW_ATTEMPTS):
+        entries, etag = load_task_entries_with_etag(hotel_id, task_id)
+        mutated = mutate(entries)
+        if mutated is _UNCHANGED:
+            return None
+        entries, result = mutated
+        try:
+            save_compliance_task(hotel_id, task_id, entries, etag=etag)
+            return result
+        except ClientError as err:
+            if not _is_precondition_failed(err) or attempt == _RMW_ATTEMPTS - 1:
+                raise
+            logger.warning("Concurrent history write for %s, retrying", hotel_id)
+
+
+def add_history_entry(hotel_id: str, task_id: str, entry: dict):
+    """Insert an entry for a task, replacing any duplicate in O(1).
+
+    Entries are held as a dict keyed by (report_date, filename) while
+    mutating, so re-uploads overwrite instead of scanning the list.
+    """
+
+    def mutate(entries):
+        by_key = {_entry_key(e): e for e in entries}
+        by_key[_entry_key(entry)] = entry
+        entries = list(by_key.values())
+        if len(entries) > MAX_ENTRIES_PER_TASK:
+            entries = entries[-MAX_ENTRIES_PER_TASK:]
+        return entries, entry
+
+    _mutate_task(hotel_id, task_id, mutate)
+    update_compliance_index("add", hotel_id, task_id, entry)
+    invalidate_score(hotel_id)
+    logger.debug("Added history entry for %s/%s", hotel_id, task_id)
+
+
+def delete_history_entry(hotel_id: str, task_id: str, filename: str):
+    """Remove an entry by filename; returns the removed entry or None."""
+
+    def mutate(entries):
+        removed = next((e for e in entries if e.get("filename") == filename), None)
+        if removed is None:
+            return _UNCHANGED
+        return [e for e in entries if e is not removed], removed
+
+    removed = _mutate_task(hotel_id, task_id, mutate)
+    if removed is not None:
+        update_compliance_index("remove", hotel_id, task_id, removed)
+        invalidate_score(hotel_id)
+        logger.debug("Deleted history entry %s for %s/%s", filename, hotel_id, task_id)
+    return removed
+
+
+def delete_history_tasks(hotel_id: str, task_ids: list) -> dict:
+    """Delete whole task histories in batches of up to 1000 keys.
+
+    One DeleteObjects call replaces a GET+PUT pair per task; Quiet mode
+    means S3 only reports failures, which are passed through so callers
+    get partial-success semantics.
+    """
+    objects = [{"Key": task_key(hotel_id, t)} for t in task_ids]
+    errors = []
+    for i in range(0, len(objects), 1000):
+        resp = s3.delete_objects(
+            Bucket=BUCKET_NAME,
+            Delete={"Objects": objects[i : i + 1000], "Quiet": True},
+        )
+        errors.extend(resp.get("Errors", []))
+    failed_keys = {e.get("Key") for e in errors}
+    deleted = [t for t in task_ids if task_key(hotel_id, t) not in failed_keys]
+    if deleted:
+        remove_tasks_from_index(hotel_id, deleted)
+        invalidate_score(hotel_id)
+    logger.debug("Batch-deleted %d task histories for %s", len(deleted), hotel_id)
+    return {"deleted": deleted, "errors": errors}
+
+
+def approve_history_entry(
+    hotel_id: str, task_id: str, report_date: str, approved_by: str
+) -> bool:
+    """Mark an entry approved; returns False if no entry matched."""
+
+    def mutate(entries):
+        for entry in entries:
+            if entry.get("report_date") == report_date:
+                entry["approved"] = True
+                entry["approved_by"] = approved_by
+                return entries, True
+        return _UNCHANGED
+
+    return bool(_mutate_task(hotel_id, task_id, mutate))
+
+
+def _approval_key(entry: dict) -> str:
+    """Fingerprint computed once per entry, used as the on-disk dict key."""
+    return f'{entry.get("hotel_id")}|{entry.get("task_id")}|{entry.get("report_date")}'
+
+
+def _load_approval_index_with_etag():
+    """Load the approval log as ({fingerprint: entry}, etag).
+
+    The log is stored keyed on disk so updates don't re-fingerprint every
+    entry; a legacy list-shaped log is converted on first read.
+    """
+    try:
+        obj = s3.get_object(Bucket=BUCKET_NAME, Key=APPROVAL_LOG_KEY)
+        log = orjson.loads(obj["Body"].read())
+        logger.debug("Loaded approval log (%d entries)", len(log))
+    except s3.exceptions.NoSuchKey:
+        return {}, None
+    if isinstance(log, list):
+        return {_approval_key(e): e for e in log}, obj.get("ETag")
+    return log, obj.get("ETag")
+
+
+def get_approval_log() -> list:
+    return list(_load_approval_index_with_etag()[0].values())
+
+
+def update_approval_log(action: str, entry: dict):
+    """Add or remove an approval-log entry.
+
+    Both actions are a single dict operation against the keyed index;
+    dict ordering preserves insertion order on disk. The log is shared
+    across hotels, so the PUT is conditional on the ETag read and the
+    cycle retries on a fresh read — concurrent approvals would otherwise
+    drop each other's entries.
+    """
+    key = _approval_key(entry)
+    for attempt in range(_RMW_ATTEMPTS):
+        index, etag = _load_approval_index_with_etag()
+        if action == "add":
+            index[key] = entry
+        elif action == "remove":
+            index.pop(key, None)
+        kwargs = {"IfMatch": etag} if etag else {}
+        try:
+            s3.put_object(
+                Bucket=BUCKET_NAME,
+                Key=APPROVAL_LOG_KEY,
+                Body=json.dumps(index, indent=2),
+                ContentType="application/json",
+                **kwargs,
+            )
+            logger.debug("Approval log updated (%s)", action)
+            return
+        except ClientError as err:
+            if not _is_precondition_failed(err) or attempt == _RMW_ATTEMPTS - 1:
+                raise
+            logger.warning("Concurrent approval-log write, retrying")
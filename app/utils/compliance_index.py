@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+
+import orjson
+from botocore.exceptions import ClientError
+
+from app.utils.aws import s3
+
+logger = logging.getLogger(__name__)
+
+BUCKET_NAME = os.getenv("AWS_BUCKET_NAME", "jmk-fm-reports")
+
+# Attempts for the optimistic read-modify-write loop on index writes,
+# matching the per-task history mutations.
+_RMW_ATTEMPTS = 3
+
+
+def index_key(hotel_id: str) -> str:
+    return f"{hotel_id}/compliance/_index.json"
+
+
+def load_compliance_index(hotel_id: str):
+    """Load the per-hotel report index: {task_id: [{report_date, last_modified}]}.
+
+    Returns None when no index exists yet so callers can fall back to
+    scanning the report objects directly.
+    """
+    try:
+        obj = s3.get_object(Bucket=BUCKET_NAME, Key=index_key(hotel_id))
+        return orjson.loads(obj["Body"].read())
+    except s3.exceptions.NoSuchKey:
+        return None
+
+
+async def load_compliance_index_async(hotel_id: str):
+    """Async variant of load_compliance_index for event-loop handlers."""
+    from app.utils import aws
+
+    try:
+        obj = await aws.aio_s3.get_object(Bucket=BUCKET_NAME, Key=index_key(hotel_id))
+        return orjson.loads(await obj["Body"].read())
+    except aws.aio_s3.exceptions.NoSuchKey:
+        return None
+
+
+def _load_index_with_etag(hotel_id: str):
+    try:
+        obj = s3.get_object(Bucket=BUCKET_NAME, Key=index_key(hotel_id))
+        return orjson.loads(obj["Body"].read()), obj.get("ETag")
+    except s3.exceptions.NoSuchKey:
+        return None, None
+
+
+def _mutate_index(hotel_id: str, mutate):
+    """Optimistic read-modify-write on the aggregate index.
+
+    *mutate* takes the index dict and returns False to skip the write.
+    The PUT is conditional on the ETag read, retried on a fresh read
+    when a concurrent writer got there first — two uploads for the same
+    hotel (different tasks) would otherwise silently drop one entry.
+    """
+    for attempt in range(_RMW_ATTEMPTS):
+        index, etag = _load_index_with_etag(hotel_id)
+        if index is None:
+            index = {}
+        if not mutate(index):
+            return
+        kwargs = {"IfMatch": etag} if etag else {}
+        try:
+            s3.put_object(
+                Bucket=BUCKET_NAME,
+                Key=index_key(hotel_id),
+                Body=json.dumps(index, indent=2),
+                ContentType="application/json",
+                **kwargs,
+            )
+            return
+        except ClientError as err:
+            code = err.response.get("Error", {}).get("Code")
+            if code != "PreconditionFailed" or attempt == _RMW_ATTEMPTS - 1:
+                raise
+            logger.warning("Concurrent index write for %s, retrying", hotel_id)
+
+
+def update_compliance_index(action: str, hotel_id: str, task_id: str, entry: dict):
+    """Keep the aggregate index in step with a history write.
+
+    The index is what lets the scorer do one GET instead of a listing
+    plus a GET per report, so every writer must pass through here.
+    """
+
+    def mutate(index):
+        reports = index.setdefault(task_id, [])
+        report_date = entry.get("report_date")
+        reports[:] = [r for r in reports if r.get("report_date") != report_date]
+        if action == "add":
+            reports.append(
+                {"report_date": report_date, "last_modified": entry.get("uploaded_at")}
+            )
+        return True
+
+    _mutate_index(hotel_id, mutate)
+    logger.debug("Compliance index updated (%s) for %s/%s", action, hotel_id, task_id)
+
+
+def remove_tasks_from_index(hotel_id: str, task_ids):
+    """Drop whole task lists after a bulk history delete.
+
+    Without this the scorer keeps counting every report of a deleted
+    task for as long as the index exists."""
+
+    def mutate(index):
+        changed = False
+        for task_id in task_ids:
+            if index.pop(task_id, None) is not None:
+                changed = True
+        return changed
+
+    _mutate_index(hotel_id, mutate)
+    logger.debug("Compliance index dropped tasks for %s", hotel_id)
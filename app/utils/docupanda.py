@@ -0,0 +1,86 @@
+import asyncio
+import base64
+import logging
+import os
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DOCUPANDA_URL = "https://app.docupanda.io"
+DOCUPANDA_API_KEY = os.getenv("DOCUPANDA_API_KEY", "")
+DOCUPANDA_SCHEMA_ID = os.getenv("DOCUPANDA_SCHEMA_ID", "")
+
+# One keep-alive client for the whole flow: upload plus two polling
+# loops would otherwise pay a TLS handshake per call.
+_client = httpx.AsyncClient(
+    base_url=DOCUPANDA_URL,
+    headers={"X-API-Key": DOCUPANDA_API_KEY, "accept": "application/json"},
+    limits=httpx.Limits(max_keepalive_connections=20),
+    timeout=30.0,
+)
+
+# Polling backs off from 0.5s so fast completions return quickly without
+# hammering the API on slow ones; never blocks the event loop.
+_POLL_INITIAL = 0.5
+_POLL_MAX = 5.0
+_POLL_ATTEMPTS = 30
+
+
+async def _poll_until_complete(path: str) -> dict:
+    delay = _POLL_INITIAL
+    for _ in range(_POLL_ATTEMPTS):
+        resp = await _client.get(path)
+        resp.raise_for_status()
+        data = resp.json()
+        status = data.get("status")
+        if status == "completed":
+            return data
+        if status in ("failed", "error"):
+            raise RuntimeError(f"DocuPanda job failed: {path}")
+        await asyncio.sleep(delay)
+        delay = min(delay * 1.5, _POLL_MAX)
+    raise TimeoutError(f"DocuPanda job did not complete: {path}")
+
+
+async def upload_document(file_bytes: bytes, filename: str) -> str:
+    """Upload a PDF and wait for ingestion; returns the document id."""
+    return await upload_document_b64(
+        base64.b64encode(file_bytes).decode("ascii"), filename
+    )
+
+
+async def upload_document_b64(contents: str, filename: str) -> str:
+    """Upload pre-encoded base64 contents; callers that stream-encode
+    avoid holding the raw bytes and the encoding at once."""
+    resp = await _client.post(
+        "/document",
+        json={
+            "document": {
+                "file": {
+                    "contents": contents,
+                    "filename": filename,
+                }
+            }
+        },
+    )
+    resp.raise_for_status()
+    doc_id = resp.json()["documentId"]
+    await _poll_until_complete(f"/document/{doc_id}")
+    logger.debug("DocuPanda document %s ingested", doc_id)
+    return doc_id
+
+
+async def standardize_document(doc_id: str, schema_id: str = None) -> dict:
+    """Run standardization on an uploaded document and return its data."""
+    resp = await _client.post(
+        "/standardize/batch",
+        json={
+            "documentIds": [doc_id],
+            "schemaId": schema_id or DOCUPANDA_SCHEMA_ID,
+        },
+    )
+    resp.raise_for_status()
+    std_id = resp.json()["standardizationIds"][0]
+    result = await _poll_until_complete(f"/standardization/{std_id}")
+    return result.get("data", {})
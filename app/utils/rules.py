@@ -0,0 +1,127 @@
+import functools
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+RULES_PATH = Path(__file__).parent.parent / "data" / "compliance.json"
+COMPILED_PATH = Path(__file__).parent.parent / "data" / "compliance_rules.py"
+
+# Per-year upload counts and validity windows by frequency; baked into
+# TaskSpec at load so the scoring loop never hashes frequency strings.
+EXPECTED_BY_FREQUENCY = {
+    "Daily": 365,
+    "Weekly": 52,
+    "Monthly": 12,
+    "Quarterly": 4,
+    "TwiceYearly": 2,
+    "Annually": 1,
+}
+
+INTERVAL_DAYS_BY_FREQUENCY = {
+    "Daily": 1,
+    "Weekly": 7,
+    "Monthly": 31,
+    "Quarterly": 92,
+    "TwiceYearly": 183,
+    "Annually": 365,
+}
+
+
+@dataclass(slots=True, frozen=True)
+class TaskSpec:
+    """One compliance task with its scoring constants precomputed."""
+
+    task_id: str
+    section: str
+    label: str
+    type: str
+    needs_report: str
+    frequency: str
+    points: int
+    expected_count: int
+    interval_days: int
+    info_popup: str
+
+
+@functools.lru_cache(maxsize=1)
+def _load_sections(mtime):
+    # The compiled module (scripts/compile_rules.py) is ready-made Python
+    # objects with no parse; fall back to the JSON when it is missing or
+    # someone edited compliance.json without regenerating.
+    try:
+        if os.path.getmtime(COMPILED_PATH) >= mtime:
+            from app.data.compliance_rules import SECTIONS
+
+            return SECTIONS
+    except OSError:
+        pass
+    with open(RULES_PATH) as f:
+        return json.load(f)
+
+
+def load_sections() -> list:
+    """Compliance rules, cached until the rules file's mtime changes."""
+    return _load_sections(os.path.getmtime(RULES_PATH))
+
+
+@functools.lru_cache(maxsize=1)
+def _derived(mtime):
+    sections = _load_sections(mtime)
+    flat = tuple(
+        (section["section"], task)
+        for section in sections
+        for task in section.get("tasks", [])
+    )
+    labels = {task["task_id"]: task.get("label", task["task_id"]) for _, task in flat}
+    specs = tuple(
+        TaskSpec(
+            task_id=task["task_id"],
+            section=section,
+            label=task.get("label", task["task_id"]),
+            type=task.get("type", "upload"),
+            needs_report=task.get("needs_report", "yes"),
+            frequency=task.get("frequency", "Annually"),
+            points=task.get("points", 20),
+            expected_count=EXPECTED_BY_FREQUENCY.get(
+                task.get("frequency", "Annually"), 1
+            ),
+            interval_days=INTERVAL_DAYS_BY_FREQUENCY.get(
+                task.get("frequency", "Annually"), 365
+            ),
+            info_popup=task.get("info_popup", ""),
+        )
+        for section, task in flat
+    )
+    return flat, labels, specs
+
+
+def flat_tasks() -> tuple:
+    """(section_name, task) pairs flattened once per rules-file version."""
+    return _derived(os.path.getmtime(RULES_PATH))[0]
+
+
+def task_labels() -> dict:
+    """task_id -> label map, built in the same cached step."""
+    return _derived(os.path.getmtime(RULES_PATH))[1]
+
+
+def task_specs() -> tuple:
+    """Flat TaskSpec tuple for hot loops: one attribute access per field,
+    no dict lookups or frequency-table hashing per task."""
+    return _derived(os.path.getmtime(RULES_PATH))[2]
+
+
+@functools.lru_cache(maxsize=1)
+def _confirmations(mtime):
+    return tuple(
+        spec
+        for spec in _derived(mtime)[2]
+        if spec.type == "confirmation" and spec.needs_report == "no"
+    )
+
+
+def confirmation_specs() -> tuple:
+    """Just the sign-off tasks, pre-filtered once per rules-file version
+    so the checklist never re-tests type/needs_report per request."""
+    return _confirmations(os.path.getmtime(RULES_PATH))
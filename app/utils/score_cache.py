@@ -0,0 +1,28 @@
+import threading
+
+from cachetools import TTLCache
+
+# Scores change on upload cadence (weekly at best) but are recomputed on
+# every dashboard view; a short TTL keeps repeat views in-process. Lives
+# in its own module so the history writers can invalidate without
+# importing the router. TTLCache does expiry bookkeeping on every access
+# and is not thread-safe, and the scorer reads on the event loop while
+# the sync history routes invalidate from worker threads, so all access
+# goes through one lock.
+_cache = TTLCache(maxsize=512, ttl=60)
+_lock = threading.Lock()
+
+
+def get_score(hotel_id: str):
+    with _lock:
+        return _cache.get(hotel_id)
+
+
+def set_score(hotel_id: str, result: dict):
+    with _lock:
+        _cache[hotel_id] = result
+
+
+def invalidate_score(hotel_id: str):
+    with _lock:
+        _cache.pop(hotel_id, None)
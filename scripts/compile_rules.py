@@ -0,0 +1,34 @@
+"""Compile app/data/compliance.json into an importable Python module.
+
+Run after editing the rules file:
+
+    python scripts/compile_rules.py
+
+Importing the generated module costs one (cached) import at process
+start instead of an open() and JSON parse; app.utils.rules falls back to
+parsing the JSON if the compiled module is older than the source.
+"""
+
+import json
+import pprint
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent.parent / "app" / "data"
+SOURCE = DATA_DIR / "compliance.json"
+TARGET = DATA_DIR / "compliance_rules.py"
+
+
+def main():
+    with open(SOURCE) as f:
+        sections = json.load(f)
+    body = pprint.pformat(sections, indent=1, width=88, sort_dicts=False)
+    TARGET.write_text(
+        "# Generated by scripts/compile_rules.py from compliance.json.\n"
+        "# Do not edit by hand; edit compliance.json and regenerate.\n\n"
+        f"SECTIONS = {body}\n"
+    )
+    print(f"Wrote {TARGET}")
+
+
+if __name__ == "__main__":
+    main()